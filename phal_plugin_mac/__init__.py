@@ -1,34 +1,70 @@
 """macOS PHAL plugin for OVOS."""
 
+import asyncio
+import hashlib
+import os
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from functools import cached_property
+from types import SimpleNamespace
 
-import osascript
 from ovos_bus_client import Message
 from ovos_plugin_manager.phal import PHALPlugin
 
+from .applescript import CHANGE_VOLUME_SCRIPT, SET_MUTE_SCRIPT, SET_VOLUME_SCRIPT, AppleScriptWorker
+from .commands import HELPER_VERBS, NTP_SYNC_SCRIPT, resolve
+from .helper_client import DEFAULT_SOCKET, DEFAULT_TIMEOUT, HelperClient, HelperUnavailableError
+
+# Four character codes of the AppleScript run event and its argv parameter
+_K_CORE_EVENT_CLASS = 0x61657674  # 'aevt'
+_K_AE_OPEN_APPLICATION = 0x6F617070  # 'oapp'
+_KEY_DIRECT_OBJECT = 0x2D2D2D2D  # '----'
+
 
 class MacOSPlugin(PHALPlugin):
     """macOS PHAL plugin for OVOS."""
 
-    def __init__(self, bus=None, config=None, *args, **kwargs):
-        super().__init__(bus=bus, config=config, name="ovos-PHAL-plugin-mac", *args, **kwargs)
+    _HANDLERS = (
         # System events
-        self.bus.on("system.ntp.sync", self.handle_ntp_sync_request)
-        self.bus.on("system.ssh.status", self.handle_ssh_status)
-        self.bus.on("system.ssh.enable", self.handle_ssh_enable_request)
-        self.bus.on("system.ssh.disable", self.handle_ssh_disable_request)
-        self.bus.on("system.reboot", self.handle_reboot_request)
-        self.bus.on("system.shutdown", self.handle_shutdown_request)
-        self.bus.on("system.configure.language", self.handle_configure_language_request)
-        self.bus.on("system.mycroft.service.restart", self.handle_mycroft_restart_request)
+        ("system.ntp.sync", "handle_ntp_sync_request"),
+        ("system.ssh.status", "handle_ssh_status"),
+        ("system.ssh.enable", "handle_ssh_enable_request"),
+        ("system.ssh.disable", "handle_ssh_disable_request"),
+        ("system.reboot", "handle_reboot_request"),
+        ("system.shutdown", "handle_shutdown_request"),
+        ("system.configure.language", "handle_configure_language_request"),
+        ("system.mycroft.service.restart", "handle_mycroft_restart_request"),
         # Volume events
-        self.bus.on("mycroft.volume.get", self.handle_volume_get)
-        self.bus.on("mycroft.volume.set", self.handle_volume_set)
-        self.bus.on("mycroft.volume.decrease", self.handle_volume_decrease)
-        self.bus.on("mycroft.volume.increase", self.handle_volume_increase)
-        self.bus.on("mycroft.volume.mute", self.handle_volume_mute)
-        self.bus.on("mycroft.volume.unmute", self.handle_volume_unmute)
-        self.bus.on("mycroft.volume.mute.toggle", self.handle_volume_mute_toggle)
+        ("mycroft.volume.get", "handle_volume_get"),
+        ("mycroft.volume.set", "handle_volume_set"),
+        ("mycroft.volume.decrease", "handle_volume_decrease"),
+        ("mycroft.volume.increase", "handle_volume_increase"),
+        ("mycroft.volume.mute", "handle_volume_mute"),
+        ("mycroft.volume.unmute", "handle_volume_unmute"),
+        ("mycroft.volume.mute.toggle", "handle_volume_mute_toggle"),
+    )
+
+    def __init__(self, bus=None, config=None, *args, **kwargs):
+        super().__init__(bus=bus, config=config, name="ovos-PHAL-plugin-mac", *args, **kwargs)
+        self._osa_cache = {}
+        self._osa_lock = threading.Lock()
+        self._scpt = {} if shutil.which("osacompile") else None
+        self._scpt_dir = None
+        self._scpt_lock = threading.Lock()
+        self._helper = HelperClient(self.helper_socket, self.helper_timeout) if self.helper_socket else None
+        self._vol_cache = (0.0, None)
+        self._mute_cache = (0.0, None)
+        self._pending_vol_delta = 0
+        self._pending_vol_message = None
+        self._vol_timer = None
+        self._vol_lock = threading.Lock()
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        for event, handler in self._HANDLERS:
+            self.bus.on(event, getattr(self, handler))
 
     @property
     def allow_reboot(self):
@@ -45,48 +81,330 @@ class MacOSPlugin(PHALPlugin):
         """Get the volume change interval percentage. Defaults to 10."""
         return self.config.get("volume_change_interval", 10)
 
-    def _run_command(self, command, check=True):
-        """Private method to run shell commands."""
+    @property
+    def volume_cache_ttl(self):
+        """Get how long, in seconds, volume and mute reads are cached. Defaults to 0.5."""
+        return self.config.get("volume_cache_ttl", 0.5)
+
+    @property
+    def helper_socket(self):
+        """Get the socket path of the helper daemon, or None to always run commands directly."""
+        return self.config.get("helper_socket", DEFAULT_SOCKET)
+
+    @property
+    def helper_timeout(self):
+        """Get how long, in seconds, to wait for the helper daemon to reply before failing a command. Defaults to 30."""
+        return self.config.get("helper_timeout", DEFAULT_TIMEOUT)
+
+    @property
+    def service_target(self):
+        """Get the launchd service restarted for OVOS. Defaults to com.ovos.service in the user's GUI session."""
+        return self.config.get("service_target", f"gui/{os.getuid()}/com.ovos.service")
+
+    @property
+    def volume_batch_delay(self):
+        """Get how long, in seconds, volume increase/decrease requests are coalesced. Defaults to 0.02."""
+        return self.config.get("volume_batch_delay", 0.02)
+
+    def _run_command(self, command, check=True, capture=True):
+        """Private method to run shell commands. Pass capture=False when the output isn't needed."""
         try:
-            return subprocess.run(command, check=check, capture_output=True, text=True)
+            result = self._run_helper_command(command)
+            if result is None:
+                output = {"capture_output": True, "text": True}
+                if not capture:
+                    output = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+                return subprocess.run(resolve(command), check=check, close_fds=False, **output)
+            if check:
+                result.check_returncode()
+            return result
         except Exception as err:
             self.log.exception("Error running command: %s", err)
 
-    def _run_applescript(self, script):
-        """Private method to run AppleScript."""
-        return_code, out, err = osascript.run(script)
-        self.log.debug("Return code for %s was %s", script, return_code)
-        if return_code and return_code > 0:
-            self.log.error("Error code %s running AppleScript: %s", return_code, err)
+    def _run_helper_command(self, command):
+        """Private method to run a command through the helper daemon, returning None if it isn't available."""
+        verb = HELPER_VERBS.get(tuple(command))
+        if verb is None or self._helper is None:
+            return
+        try:
+            returncode, stdout, stderr = self._helper.run(verb)
+        except HelperUnavailableError as err:
+            self.log.debug("Running %s without the helper: %s", verb, err)
+            return
+        except OSError as err:
+            # The helper may already have run the command, so report a failure instead of running it again
+            self.log.error("Helper failed to run %s: %s", verb, err)
+            return subprocess.CompletedProcess(command, 1, "", str(err))
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+    @cached_property
+    def _audio(self):
+        """Private property loading CoreAudio on first use, or None to fall back to AppleScript."""
+        from .coreaudio import CoreAudio  # pylint: disable=import-outside-toplevel
+
+        try:
+            return CoreAudio()
+        except OSError as err:
+            self.log.debug("CoreAudio unavailable, using AppleScript for volume control: %s", err)
+            return
+
+    def _call_coreaudio(self, method, *args):
+        """Private method to call CoreAudio, returning None if it is unavailable or fails."""
+        if self._audio is None:
+            return
+        try:
+            return getattr(self._audio, method)(*args)
+        except OSError as err:
+            self.log.debug("CoreAudio %s failed, falling back to AppleScript: %s", method, err)
+            return
+
+    @cached_property
+    def _pyobjc(self):
+        """Private property importing the PyObjC AppleScript classes on first use, or None without PyObjC."""
+        # pylint: disable=import-outside-toplevel
+        try:
+            from Foundation import NSAppleEventDescriptor, NSAppleScript
+        except ImportError:  # PyObjC is only available on macOS
+            return
+        try:
+            from OSAKit import OSALanguage, OSAScript
+        except ImportError:
+            OSALanguage = OSAScript = None
+        return SimpleNamespace(
+            NSAppleEventDescriptor=NSAppleEventDescriptor,
+            NSAppleScript=NSAppleScript,
+            OSALanguage=OSALanguage,
+            OSAScript=OSAScript,
+        )
+
+    @cached_property
+    def _osa_worker(self):
+        """Private property creating the AppleScript worker on first use, only needed without PyObjC."""
+        if self._pyobjc is not None or not shutil.which("osascript"):
+            return None
+        return AppleScriptWorker()
+
+    def _compile_applescript(self, script):
+        """Private method to compile AppleScript in-process with OSAKit or NSAppleScript, caching by source text."""
+        compiled = self._osa_cache.get(script)
+        if compiled is None:
+            objc = self._pyobjc
+            if objc.OSAScript is not None:
+                language = objc.OSALanguage.languageForName_("AppleScript")
+                compiled = objc.OSAScript.alloc().initWithSource_language_(script, language)
+            else:
+                compiled = objc.NSAppleScript.alloc().initWithSource_(script)
+            ok, err = compiled.compileAndReturnError_(None)
+            if not ok:
+                self.log.error("Error compiling AppleScript: %s", err)
+                return
+            self._osa_cache[script] = compiled
+        return compiled
+
+    def _submit(self, coro):
+        """Private method to run a coroutine on the plugin's event loop, starting the loop on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_loop, args=(self._loop,), name=f"{self.name}-loop")
+                thread.daemon = True
+                thread.start()
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(self._log_task_error)
+        return future
+
+    @staticmethod
+    def _run_loop(loop):
+        """Private method to run an event loop until it is stopped, then cancel its remaining tasks and close it."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    def _log_task_error(self, future):
+        """Private method to log errors a submitted coroutine didn't handle."""
+        if not future.cancelled() and future.exception() is not None:
+            self.log.error("Error in background task: %s", future.exception())
+
+    async def _run_command_async(self, command, check=True):
+        """Private coroutine to run shell commands without blocking the bus, discarding their output."""
+        result = None
+        if self._helper is not None and tuple(command) in HELPER_VERBS:
+            result = await asyncio.get_running_loop().run_in_executor(None, self._run_helper_command, command)
+        if result is not None:
+            returncode = result.returncode
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *resolve(command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=False
+            )
+            returncode = await proc.wait()
+        if check and returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+        return returncode
+
+    def _compiled_script_path(self, script):
+        """Private method to compile AppleScript to a .scpt file once, returning its path."""
+        with self._scpt_lock:
+            # Compile into a private directory only we can write to, so we never run a script someone else planted.
+            # Temp directories get cleaned up, so start a new one if it is gone
+            if self._scpt_dir is None or not os.path.isdir(self._scpt_dir):
+                self._scpt_dir = tempfile.mkdtemp(prefix="ovos-phal-plugin-mac-")
+            digest = self._scpt.get(script)
+            if digest is None:
+                digest = self._scpt[script] = hashlib.sha1(script.encode("utf-8")).hexdigest()
+            path = os.path.join(self._scpt_dir, f"{digest}.scpt")
+            if not os.path.exists(path):
+                # Compile under another name and move it into place, so an interrupted compile can't leave a
+                # partial file at path
+                partial = os.path.join(self._scpt_dir, f"{digest}.partial.scpt")
+                if self._run_command(["osacompile", "-o", partial, "-e", script], capture=False) is None:
+                    return
+                try:
+                    os.replace(partial, path)
+                except OSError as err:
+                    self.log.error("Error saving compiled AppleScript: %s", err)
+                    return
+            return path
+
+    def _run_event(self, args):
+        """Private method to build the run event that passes args to a script's run handler as argv."""
+        descriptor = self._pyobjc.NSAppleEventDescriptor
+        argv = descriptor.listDescriptor()
+        for index, arg in enumerate(args, start=1):
+            argv.insertDescriptor_atIndex_(descriptor.descriptorWithString_(str(arg)), index)
+        event = descriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+            _K_CORE_EVENT_CLASS, _K_AE_OPEN_APPLICATION, descriptor.currentProcessDescriptor(), -1, 0
+        )
+        event.setParamDescriptor_forKeyword_(argv, _KEY_DIRECT_OBJECT)
+        return event
+
+    def _run_applescript(self, script, *args):
+        """Private method to run AppleScript, passing any args to its run handler."""
+        if self._pyobjc is not None:
+            # Compiled scripts aren't safe to share between threads, so run one at a time
+            with self._osa_lock:
+                compiled = self._compile_applescript(script)
+                if compiled is None:
+                    return
+                if args:
+                    desc, err = compiled.executeAppleEvent_error_(self._run_event(args), None)
+                else:
+                    desc, err = compiled.executeAndReturnError_(None)
+            if desc is None:
+                self.log.error("Error running AppleScript: %s", err)
+                return
+            return desc.stringValue()
+        if self._osa_worker is not None:
+            try:
+                err, out = self._osa_worker.run(script, *args)
+            except Exception as worker_err:
+                self.log.warning("AppleScript worker failed, falling back to osascript: %s", worker_err)
+            else:
+                if err:
+                    self.log.error("Error running AppleScript: %s", err)
+                    return
+                return out
+        compiled_path = self._compiled_script_path(script) if self._scpt is not None else None
+        command = ["osascript", compiled_path] if compiled_path else ["osascript", "-e", script]
+        command.extend(str(arg) for arg in args)
+        result = self._run_command(command, check=False)
+        if result is None:
+            return
+        self.log.debug("Return code for %s was %s", script, result.returncode)
+        if result.returncode:
+            self.log.error("Error code %s running AppleScript: %s", result.returncode, result.stderr)
             return
-        return out
+        return result.stdout.strip()
 
     def _set_volume(self, volume):
         """Set the system volume (0-100)."""
-        script = f"set volume output volume {volume}"
-        self._run_applescript(script)
+        self._vol_cache = (0.0, None)
+        if self._call_coreaudio("set_volume", volume) is not None:
+            return
+        self._run_applescript(SET_VOLUME_SCRIPT, volume)
+
+    def _cached_volume(self):
+        """Get the cached system volume, or None if it has expired."""
+        timestamp, volume = self._vol_cache
+        if time.monotonic() - timestamp < self.volume_cache_ttl:
+            return volume
+        return None
 
     def _get_volume(self):
         """Get the current system volume (0-100)."""
-        script = "output volume of (get volume settings)"
-        result = self._run_applescript(script)
-        self.log.debug("Current volume: %s", result)
-        return int(result) if result else None
+        volume = self._cached_volume()
+        if volume is not None:
+            return volume
+        volume = self._call_coreaudio("get_volume")
+        if volume is None:
+            script = "output volume of (get volume settings)"
+            result = self._run_applescript(script)
+            volume = int(result) if result else None
+        self.log.debug("Current volume: %s", volume)
+        self._vol_cache = (time.monotonic(), volume)
+        return volume
 
     def _is_muted(self):
         """Check if the system is muted."""
-        script = "output muted of (get volume settings)"
-        result = self._run_applescript(script)
-        if not result:
-            return False
-        return "true" in result.lower()
+        timestamp, muted = self._mute_cache
+        if muted is not None and time.monotonic() - timestamp < self.volume_cache_ttl:
+            return muted
+        muted = self._call_coreaudio("is_muted")
+        if muted is None:
+            # Return text, as not every backend converts AppleScript booleans to strings
+            script = "(output muted of (get volume settings)) as text"
+            result = self._run_applescript(script)
+            if not result:
+                return False
+            muted = result.strip() == "true"
+        self._mute_cache = (time.monotonic(), muted)
+        return muted
 
     def _set_mute(self, mute):
         """Set the system mute state."""
-        script = "set volume with output muted"
-        if not mute:
-            script = "set volume without output muted"
-        self._run_applescript(script)
+        self._mute_cache = (0.0, None)
+        if self._call_coreaudio("set_mute", mute) is not None:
+            return
+        self._run_applescript(SET_MUTE_SCRIPT, "true" if mute else "false")
+
+    def _change_volume(self, delta):
+        """Change the system volume by delta, clamped to 0-100, in a single call.
+
+        Returns a (previous volume, new volume) tuple, or None on error. The volume is only written if it changes.
+        """
+        self._vol_cache = (0.0, None)
+        volume = self._call_coreaudio("get_volume")
+        if volume is not None:
+            new_volume = max(0, min(100, volume + delta))
+            if new_volume == volume or self._call_coreaudio("set_volume", new_volume) is not None:
+                return volume, new_volume
+        result = self._run_applescript(CHANGE_VOLUME_SCRIPT, delta)
+        self.log.debug("Previous and new volume: %s", result)
+        if not result:
+            return None
+        volume, new_volume = result.split()
+        return int(volume), int(new_volume)
+
+    def _toggle_mute(self):
+        """Toggle the system mute state in a single call. Returns the new mute state, or None on error."""
+        self._mute_cache = (0.0, None)
+        muted = self._call_coreaudio("is_muted")
+        if muted is not None and self._call_coreaudio("set_mute", not muted) is not None:
+            return not muted
+        script = (
+            "set m to not (output muted of (get volume settings))\n"
+            "set volume output muted m\n"
+            "return m as text"
+        )
+        result = self._run_applescript(script)
+        if not result:
+            return None
+        return result.strip() == "true"
 
     def handle_volume_get(self, message: Message):
         """Handle the volume get request."""
@@ -100,26 +418,54 @@ class MacOSPlugin(PHALPlugin):
         """Handle the volume set request."""
         volume = message.data.get("percent", 50)
         volume = max(0, min(100, volume))  # Ensure volume is between 0 and 100
-        self._set_volume(volume)
+        with self._vol_lock:
+            # An absolute volume supersedes any relative change still waiting to be applied
+            self._cancel_volume_change()
+            if volume == self._cached_volume():
+                return
+            self._set_volume(volume)
         self.bus.emit(message.forward("mycroft.volume.set.confirm", {"percent": volume}))
 
+    def _queue_volume_change(self, delta, message: Message):
+        """Queue a volume change, coalescing bursts of requests into a single write."""
+        with self._vol_lock:
+            self._pending_vol_delta += delta
+            self._pending_vol_message = message
+            if self._vol_timer is None:
+                self._vol_timer = threading.Timer(self.volume_batch_delay, self._flush_volume)
+                self._vol_timer.daemon = True
+                self._vol_timer.start()
+
+    def _cancel_volume_change(self):
+        """Drop the queued volume change, if any. The caller must hold the volume lock."""
+        if self._vol_timer is not None:
+            self._vol_timer.cancel()
+        self._pending_vol_delta, self._pending_vol_message, self._vol_timer = 0, None, None
+
+    def _flush_volume(self):
+        """Apply the queued volume change and confirm it once."""
+        # Hold the lock while writing so the change can't land after a later volume set
+        with self._vol_lock:
+            delta, message = self._pending_vol_delta, self._pending_vol_message
+            self._cancel_volume_change()
+            if message is None:
+                return
+            volumes = self._change_volume(delta)
+        if volumes is None:
+            self.log.error("Error changing Mac volume")
+            return
+        current_volume, new_volume = volumes
+        if new_volume == current_volume:
+            return
+        self.bus.emit(message.forward("mycroft.volume.set.confirm", {"percent": new_volume}))
+
     def handle_volume_decrease(self, message: Message):
         """Handle the volume decrease request."""
-        current_volume = self._get_volume()
-        new_volume = max(
-            0, current_volume - self.volume_change_interval
-        )  # Decrease by volume_change_interval, but not below 0
-        self._set_volume(new_volume)
-        self.bus.emit(message.forward("mycroft.volume.set.confirm", {"percent": new_volume}))
+        self._queue_volume_change(-self.volume_change_interval, message)
 
     def handle_volume_increase(self, message: Message):
         """Handle the volume increase request."""
-        current_volume = self._get_volume()
-        new_volume = min(
-            100, current_volume + self.volume_change_interval
-        )  # Increase by volume_change_interval, but not above 100
-        self._set_volume(new_volume)
-        self.bus.emit(message.forward("mycroft.volume.set.confirm", {"percent": new_volume}))
+        self._queue_volume_change(self.volume_change_interval, message)
 
     def handle_volume_mute(self, message: Message):
         """Handle the volume mute request."""
@@ -133,9 +479,11 @@ class MacOSPlugin(PHALPlugin):
 
     def handle_volume_mute_toggle(self, message: Message):
         """Handle the volume mute toggle request."""
-        current_mute = self._is_muted()
-        self._set_mute(not current_mute)
-        self.bus.emit(message.forward("mycroft.volume.mute.confirm", {"muted": not current_mute}))
+        muted = self._toggle_mute()
+        if muted is None:
+            self.log.error("Error toggling Mac mute")
+            return
+        self.bus.emit(message.forward("mycroft.volume.mute.confirm", {"muted": muted}))
 
     def _get_ntp_server(self):
         """Private method to get the configured NTP server."""
@@ -148,11 +496,15 @@ class MacOSPlugin(PHALPlugin):
 
     def handle_ntp_sync_request(self, message: Message):
         """Handle the NTP sync request."""
+        return self._submit(self._sync_ntp(message))
+
+    async def _sync_ntp(self, message: Message):
+        """Private coroutine to sync the clock with the configured NTP server."""
         try:
-            ntp_server = self._get_ntp_server()
-            self._run_command(["sntp", "-sS", ntp_server])
+            await self._run_command_async(["/bin/sh", "-c", NTP_SYNC_SCRIPT])
             self.bus.emit(message.forward("system.ntp.sync.complete"))
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, OSError) as err:
+            self.log.error("Error running command: %s", err)
             self.bus.emit(message.forward("system.ntp.sync.failed"))
 
     def handle_ssh_status(self, message: Message):
@@ -163,6 +515,10 @@ class MacOSPlugin(PHALPlugin):
 
     def handle_ssh_enable_request(self, message: Message):
         """Handle the SSH enable request."""
+        return self._submit(self._enable_ssh(message))
+
+    async def _enable_ssh(self, message: Message):
+        """Private coroutine to enable SSH."""
         try:
             script = """
             tell application "System Events"
@@ -170,14 +526,21 @@ class MacOSPlugin(PHALPlugin):
                 display dialog "OVOS needs Full Disk Access to enable Remote Login. Please grant permission in System Preferences." buttons {"OK"} default button "OK"
             end tell
             """
-            self._run_applescript(script)
-            self._run_command(["systemsetup", "-setremotelogin", "on"])
+            # The dialog stays up until it is dismissed, so show it from its own osascript process rather than
+            # tying up the shared AppleScript backends
+            await self._run_command_async(["osascript", "-e", script], check=False)
+            await self._run_command_async(["systemsetup", "-setremotelogin", "on"])
             self.bus.emit(message.forward("system.ssh.enabled"))
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, OSError) as err:
+            self.log.error("Error running command: %s", err)
             self.bus.emit(message.forward("system.ssh.enable.failed"))
 
     def handle_ssh_disable_request(self, message: Message):
         """Handle the SSH disable request."""
+        return self._submit(self._disable_ssh(message))
+
+    async def _disable_ssh(self, message: Message):
+        """Private coroutine to disable SSH."""
         try:
             script = """
             tell application "System Events"
@@ -185,52 +548,73 @@ class MacOSPlugin(PHALPlugin):
                 display dialog "OVOS needs Full Disk Access to disable Remote Login. Please grant permission in System Preferences." buttons {"OK"} default button "OK"
             end tell
             """
-            self._run_applescript(script)
-            self._run_command(["systemsetup", "-setremotelogin", "off"])
+            await self._run_command_async(["osascript", "-e", script], check=False)
+            await self._run_command_async(["systemsetup", "-setremotelogin", "off"])
             self.bus.emit(message.forward("system.ssh.disabled"))
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, OSError) as err:
+            self.log.error("Error running command: %s", err)
             self.bus.emit(message.forward("system.ssh.disable.failed"))
 
     def handle_reboot_request(self, message: Message):
         """Handle the reboot request."""
-        if self.allow_reboot is False:
+        if not self.allow_reboot:
             self.bus.emit(message.forward("system.reboot.failed"))
-        try:
-            self._run_command(["shutdown", "-r", "now"])
-        except subprocess.CalledProcessError:
+            return
+        result = self._run_command(["shutdown", "-r", "now"], check=False, capture=False)
+        if result is None or result.returncode:
             self.bus.emit(message.forward("system.reboot.failed"))
 
     def handle_shutdown_request(self, message: Message):
         """Handle the shutdown request."""
-        if self.allow_shutdown is False:
+        if not self.allow_shutdown:
             self.bus.emit(message.forward("system.shutdown.failed"))
-        try:
-            self._run_command(["shutdown", "-h", "now"])
-        except subprocess.CalledProcessError:
+            return
+        result = self._run_command(["shutdown", "-h", "now"], check=False, capture=False)
+        if result is None or result.returncode:
             self.bus.emit(message.forward("system.shutdown.failed"))
 
     def handle_configure_language_request(self, message: Message):
         """Handle the configure language request."""
         lang = message.data.get("lang")
         if lang:
-            try:
-                self._run_command(["defaults", "write", "NSGlobalDomain", "AppleLanguages", f'("{lang}")'])
-                self.bus.emit(message.forward("system.language.configured", {"lang": lang}))
-            except subprocess.CalledProcessError:
-                self.bus.emit(message.forward("system.language.configure.failed"))
-        else:
-            self.bus.emit(message.forward("system.language.configure.failed", {"error": "Language not specified"}))
+            return self._submit(self._configure_language(message, lang))
+        self.bus.emit(message.forward("system.language.configure.failed", {"error": "Language not specified"}))
+
+    async def _configure_language(self, message: Message, lang):
+        """Private coroutine to set the system language."""
+        try:
+            await self._run_command_async(["defaults", "write", "NSGlobalDomain", "AppleLanguages", f'("{lang}")'])
+            self.bus.emit(message.forward("system.language.configured", {"lang": lang}))
+        except (subprocess.CalledProcessError, OSError) as err:
+            self.log.error("Error running command: %s", err)
+            self.bus.emit(message.forward("system.language.configure.failed"))
 
     def handle_mycroft_restart_request(self, message: Message):
         """Handle the Mycroft restart request."""
         try:
-            self._run_command(["launchctl", "stop", "com.ovos.service"])
-            self._run_command(["launchctl", "start", "com.ovos.service"])
+            # kickstart -k restarts the service in one call
+            self._run_command(["launchctl", "kickstart", "-k", self.service_target], capture=False)
             self.bus.emit(message.forward("system.mycroft.service.restarted"))
         except subprocess.CalledProcessError as err:
             self.log.exception("OVOS service request restart failed", err)
             self.bus.emit(message.forward("system.mycroft.service.restart.failed"))
 
+    def shutdown(self):
+        """Stop the plugin's event loop and AppleScript worker, dropping any queued volume change."""
+        with self._vol_lock:
+            self._cancel_volume_change()
+        # Look the worker up without the property, so shutting down doesn't create one
+        worker = vars(self).get("_osa_worker")
+        if worker is not None:
+            worker.close()
+        if self._scpt_dir is not None:
+            shutil.rmtree(self._scpt_dir, ignore_errors=True)
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        super().shutdown()
+
 
 if __name__ == "__main__":
     from ovos_utils.fakebus import FakeBus
@@ -0,0 +1,135 @@
+"""Persistent AppleScript worker for the macOS PHAL plugin."""
+
+import atexit
+import json
+import subprocess
+import threading
+
+from .commands import BINARIES
+
+# JavaScript for Automation program that reads one JSON-encoded [source, ...arguments] request per line from stdin,
+# runs it with NSAppleScript (compiling each distinct source once) and writes one JSON reply per line.
+# Arguments are passed to the script's run handler as argv, just like osascript does on the command line.
+_WORKER_SOURCE = """
+ObjC.import("Foundation");
+var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+var compiled = {};
+var pending = "";
+function runEvent(args) {
+    var argv = $.NSAppleEventDescriptor.listDescriptor;
+    args.forEach(function (arg, index) {
+        argv.insertDescriptorAtIndex($.NSAppleEventDescriptor.descriptorWithString(arg), index + 1);
+    });
+    // kCoreEventClass/kAEOpenApplication is the run event; keyDirectObject carries argv
+    var event = $.NSAppleEventDescriptor.appleEventWithEventClassEventIDTargetDescriptorReturnIDTransactionID(
+        0x61657674, 0x6f617070, $.NSAppleEventDescriptor.currentProcessDescriptor, -1, 0
+    );
+    event.setParamDescriptorForKeyword(argv, 0x2d2d2d2d);
+    return event;
+}
+function execute(request) {
+    var source = request[0];
+    var args = request.slice(1);
+    if (!(source in compiled)) {
+        compiled[source] = $.NSAppleScript.alloc.initWithSource(source);
+    }
+    var error = Ref();
+    var result = args.length
+        ? compiled[source].executeAppleEventError(runEvent(args), error)
+        : compiled[source].executeAndReturnError(error);
+    if (result.isNil()) {
+        return {error: ObjC.deepUnwrap(error[0])};
+    }
+    var value = result.stringValue;
+    return {result: value.isNil() ? "" : value.js};
+}
+while (true) {
+    var data = stdin.availableData;
+    if (data.length === 0) {
+        break;
+    }
+    pending += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    var index;
+    while ((index = pending.indexOf("\\n")) >= 0) {
+        var reply = JSON.stringify(execute(JSON.parse(pending.slice(0, index)))) + "\\n";
+        pending = pending.slice(index + 1);
+        stdout.writeData($(reply).dataUsingEncoding($.NSUTF8StringEncoding));
+    }
+}
+"""
+
+# Parameterized sources, so each is compiled once and the values are passed to its run handler as argv
+SET_VOLUME_SCRIPT = "on run argv\n\tset volume output volume (item 1 of argv as integer)\nend run"
+SET_MUTE_SCRIPT = 'on run argv\n\tset volume output muted (item 1 of argv is "true")\nend run'
+CHANGE_VOLUME_SCRIPT = (
+    "on run argv\n"
+    "\tset v to output volume of (get volume settings)\n"
+    "\tset n to v + (item 1 of argv as integer)\n"
+    "\tif n > 100 then set n to 100\n"
+    "\tif n < 0 then set n to 0\n"
+    "\tif n is not v then set volume output volume n\n"
+    '\treturn (v as text) & " " & (n as text)\n'
+    "end run"
+)
+
+
+class AppleScriptWorker:
+    """Long-running osascript process that runs AppleScript sources without a fork/exec per call."""
+
+    command = [BINARIES["osascript"], "-l", "JavaScript", "-e", _WORKER_SOURCE]
+
+    def __init__(self):
+        self._proc = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _start(self):
+        """Start the worker process."""
+        self._proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            close_fds=False,
+        )
+
+    def _stop(self):
+        """Stop the worker process, if running."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=1)
+        except Exception:  # pylint: disable=broad-except
+            proc.kill()
+
+    def run(self, script, *args):
+        """Run an AppleScript source, passing any args to its run handler, and return an (error, result) tuple.
+
+        Raises if the worker process cannot be used; the caller should fall back to a one-shot osascript call.
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            try:
+                self._proc.stdin.write(json.dumps([script, *map(str, args)]) + "\n")
+                self._proc.stdin.flush()
+                line = self._proc.stdout.readline()
+                if not line:
+                    raise EOFError("AppleScript worker exited")
+                reply = json.loads(line)
+            except BaseException:
+                # The request/reply stream is out of step now, so start over with a fresh process next time
+                self._stop()
+                raise
+        return reply.get("error"), reply.get("result")
+
+    def close(self):
+        """Stop the worker process."""
+        atexit.unregister(self.close)
+        with self._lock:
+            self._stop()
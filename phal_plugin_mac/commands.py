@@ -0,0 +1,30 @@
+"""System commands run by the macOS PHAL plugin and its helper daemon."""
+
+# Absolute paths skip the PATH search and, with close_fds=False, let subprocess launch with posix_spawn
+BINARIES = {
+    "defaults": "/usr/bin/defaults",
+    "launchctl": "/bin/launchctl",
+    "osacompile": "/usr/bin/osacompile",
+    "osascript": "/usr/bin/osascript",
+    "shutdown": "/sbin/shutdown",
+    "sntp": "/usr/bin/sntp",
+    "systemsetup": "/usr/sbin/systemsetup",
+}
+# Look up the configured NTP server and sync against it in a single spawn
+NTP_SYNC_SCRIPT = "/usr/bin/sntp -sS \"$(/usr/sbin/systemsetup -getnetworktimeserver | sed 's/.*: //')\""
+
+# Commands the helper daemon will run, by verb. Only these can be requested over its socket.
+HELPER_COMMANDS = {
+    "NTP SYNC": ("/bin/sh", "-c", NTP_SYNC_SCRIPT),
+    "SSH STATUS": ("systemsetup", "-getremotelogin"),
+    "SSH ON": ("systemsetup", "-setremotelogin", "on"),
+    "SSH OFF": ("systemsetup", "-setremotelogin", "off"),
+    "REBOOT": ("shutdown", "-r", "now"),
+    "SHUTDOWN": ("shutdown", "-h", "now"),
+}
+HELPER_VERBS = {command: verb for verb, command in HELPER_COMMANDS.items()}
+
+
+def resolve(command):
+    """Replace the program name of a command with its absolute path, if known."""
+    return [BINARIES.get(command[0], command[0]), *command[1:]]
@@ -0,0 +1,151 @@
+"""CoreAudio volume and mute control for the macOS PHAL plugin."""
+
+import ctypes
+import struct
+
+COREAUDIO_PATH = "/System/Library/Frameworks/CoreAudio.framework/CoreAudio"
+AUDIOTOOLBOX_PATH = "/System/Library/Frameworks/AudioToolbox.framework/AudioToolbox"
+
+
+def _fourcc(code):
+    """Convert a four character code to the UInt32 CoreAudio expects."""
+    return struct.unpack(">I", code.encode("ascii"))[0]
+
+
+_SYSTEM_OBJECT = 1  # kAudioObjectSystemObject
+_DEFAULT_OUTPUT_DEVICE = _fourcc("dOut")  # kAudioHardwarePropertyDefaultOutputDevice
+_VOLUME_SCALAR = _fourcc("volm")  # kAudioDevicePropertyVolumeScalar
+_VIRTUAL_MAIN_VOLUME = _fourcc("vmvc")  # kAudioHardwareServiceDeviceProperty_VirtualMainVolume
+_MUTE = _fourcc("mute")  # kAudioDevicePropertyMute
+_SCOPE_GLOBAL = _fourcc("glob")  # kAudioObjectPropertyScopeGlobal
+_SCOPE_OUTPUT = _fourcc("outp")  # kAudioDevicePropertyScopeOutput
+_ELEMENT_MAIN = 0  # kAudioObjectPropertyElementMain
+_STEREO_CHANNELS = (1, 2)
+
+
+class _PropertyAddress(ctypes.Structure):
+    """AudioObjectPropertyAddress."""
+
+    _fields_ = [("mSelector", ctypes.c_uint32), ("mScope", ctypes.c_uint32), ("mElement", ctypes.c_uint32)]
+
+
+def _load_library(path, prefix):
+    """Load a framework and declare the prototypes of its {prefix}HasProperty/GetPropertyData/SetPropertyData."""
+    lib = ctypes.CDLL(path)
+    has_property = getattr(lib, f"{prefix}HasProperty")
+    has_property.restype = ctypes.c_ubyte
+    has_property.argtypes = [ctypes.c_uint32, ctypes.POINTER(_PropertyAddress)]
+    get_property = getattr(lib, f"{prefix}GetPropertyData")
+    get_property.restype = ctypes.c_int32
+    get_property.argtypes = [
+        ctypes.c_uint32,
+        ctypes.POINTER(_PropertyAddress),
+        ctypes.c_uint32,
+        ctypes.c_void_p,
+        ctypes.POINTER(ctypes.c_uint32),
+        ctypes.c_void_p,
+    ]
+    set_property = getattr(lib, f"{prefix}SetPropertyData")
+    set_property.restype = ctypes.c_int32
+    set_property.argtypes = [
+        ctypes.c_uint32,
+        ctypes.POINTER(_PropertyAddress),
+        ctypes.c_uint32,
+        ctypes.c_void_p,
+        ctypes.c_uint32,
+        ctypes.c_void_p,
+    ]
+    return lib
+
+
+class _Properties:
+    """The HasProperty/GetPropertyData/SetPropertyData functions of one API, e.g. AudioObject."""
+
+    def __init__(self, lib, prefix):
+        self.prefix = prefix
+        self._has = getattr(lib, f"{prefix}HasProperty")
+        self._get = getattr(lib, f"{prefix}GetPropertyData")
+        self._set = getattr(lib, f"{prefix}SetPropertyData")
+
+    def has(self, object_id, address):
+        """Check if an object has a property."""
+        return bool(self._has(object_id, address))
+
+    def get(self, object_id, address, data):
+        """Read a property into a ctypes value."""
+        size = ctypes.c_uint32(ctypes.sizeof(data))
+        status = self._get(object_id, ctypes.byref(address), 0, None, ctypes.byref(size), ctypes.byref(data))
+        if status:
+            raise OSError(status, f"{self.prefix}GetPropertyData failed for selector {address.mSelector:#x}")
+        return data.value
+
+    def set(self, object_id, address, data):
+        """Write a property from a ctypes value."""
+        status = self._set(object_id, ctypes.byref(address), 0, None, ctypes.sizeof(data), ctypes.byref(data))
+        if status:
+            raise OSError(status, f"{self.prefix}SetPropertyData failed for selector {address.mSelector:#x}")
+
+
+class CoreAudio:
+    """Volume and mute of the default output device, read and written directly through the CoreAudio HAL.
+
+    Raises OSError on construction if CoreAudio can't be loaded, and from any method if a HAL call fails.
+    """
+
+    def __init__(self, lib=None, toolbox=None):
+        self._hal = _Properties(lib or _load_library(COREAUDIO_PATH, "AudioObject"), "AudioObject")
+        # AudioToolbox provides the virtual main volume the system volume slider uses
+        self._service = _Properties(
+            toolbox or _load_library(AUDIOTOOLBOX_PATH, "AudioHardwareService"), "AudioHardwareService"
+        )
+
+    def _device(self):
+        """Get the default output device, which can change at any time."""
+        address = _PropertyAddress(_DEFAULT_OUTPUT_DEVICE, _SCOPE_GLOBAL, _ELEMENT_MAIN)
+        return self._hal.get(_SYSTEM_OBJECT, address, ctypes.c_uint32())
+
+    def _addresses(self, device, selector):
+        """Get the addresses of a device control, preferring the main element over per-channel controls."""
+        for elements in ((_ELEMENT_MAIN,), _STEREO_CHANNELS):
+            addresses = [_PropertyAddress(selector, _SCOPE_OUTPUT, element) for element in elements]
+            addresses = [address for address in addresses if self._hal.has(device, address)]
+            if addresses:
+                return addresses
+        raise OSError(f"Output device {device} has no control for selector {selector:#x}")
+
+    def _volume_controls(self, device):
+        """Get the API and addresses of a device's volume, preferring the virtual main volume."""
+        address = _PropertyAddress(_VIRTUAL_MAIN_VOLUME, _SCOPE_OUTPUT, _ELEMENT_MAIN)
+        if self._service.has(device, address):
+            return self._service, [address]
+        return self._hal, self._addresses(device, _VOLUME_SCALAR)
+
+    def get_volume(self):
+        """Get the output volume (0-100)."""
+        device = self._device()
+        api, addresses = self._volume_controls(device)
+        # Like the virtual main volume, the loudest channel is the volume and the rest is balance
+        return round(100 * max(api.get(device, address, ctypes.c_float()) for address in addresses))
+
+    def set_volume(self, volume):
+        """Set the output volume (0-100), returning it. Per-channel volumes are scaled to keep their balance."""
+        device = self._device()
+        api, addresses = self._volume_controls(device)
+        levels = [api.get(device, address, ctypes.c_float()) for address in addresses]
+        loudest = max(levels)
+        for address, level in zip(addresses, levels):
+            scale = level / loudest if loudest else 1.0
+            api.set(device, address, ctypes.c_float(volume / 100 * scale))
+        return volume
+
+    def is_muted(self):
+        """Check if the output is muted."""
+        device = self._device()
+        return all(self._hal.get(device, address, ctypes.c_uint32()) for address in self._addresses(device, _MUTE))
+
+    def set_mute(self, mute):
+        """Set the output mute state, returning it."""
+        device = self._device()
+        for address in self._addresses(device, _MUTE):
+            self._hal.set(device, address, ctypes.c_uint32(int(mute)))
+        return mute
@@ -0,0 +1,119 @@
+"""Helper daemon that runs the macOS PHAL plugin's system commands over a Unix domain socket.
+
+Run as a launchd daemon, the helper keeps privileged commands off the plugin's process and out of the sudoers file:
+
+    python -m ovos_phal_plugin_mac.helper --socket /var/run/ovos-mac.sock --user ovos
+
+Only root and the configured user may connect. Clients send one verb from HELPER_COMMANDS per line and get one JSON
+reply per line with the command's returncode, stdout and stderr. REBOOT and SHUTDOWN are refused unless the daemon
+is started with --allow-reboot and --allow-shutdown.
+"""
+
+import argparse
+import json
+import os
+import pwd
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+
+from .commands import HELPER_COMMANDS, resolve
+from .helper_client import DEFAULT_SOCKET
+
+# Verbs the daemon only runs when explicitly allowed on its command line
+OPT_IN_VERBS = frozenset({"REBOOT", "SHUTDOWN"})
+
+# macOS exposes the peer's credentials as a struct xucred through SOL_LOCAL/LOCAL_PEERCRED (see sys/un.h)
+_SOL_LOCAL = 0
+_LOCAL_PEERCRED = getattr(socket, "LOCAL_PEERCRED", 0x001)
+_XUCRED = "IIh16I"  # cr_version, cr_uid, cr_ngroups, cr_groups
+_UCRED = "3i"  # pid, uid, gid
+
+
+def peer_uid(sock):
+    """Get the uid of the process on the other end of a connected Unix domain socket."""
+    if sys.platform == "darwin":
+        creds = sock.getsockopt(_SOL_LOCAL, _LOCAL_PEERCRED, struct.calcsize(_XUCRED))
+        return struct.unpack_from("II", creds)[1]
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize(_UCRED))
+    return struct.unpack(_UCRED, creds)[1]
+
+
+def _lookup_uid(user):
+    """Get the uid of a user name or numeric uid."""
+    if str(user).isdigit():
+        return int(user)
+    return pwd.getpwnam(user).pw_uid
+
+
+class _HelperHandler(socketserver.StreamRequestHandler):
+    """Run the verbs sent on one connection, replying to each in turn."""
+
+    def handle(self):
+        for line in self.rfile:
+            verb = line.decode("utf-8").strip()
+            command = HELPER_COMMANDS.get(verb)
+            if command is None:
+                reply = {"returncode": 127, "stdout": "", "stderr": f"Unknown verb: {verb}"}
+            elif verb in OPT_IN_VERBS and verb not in self.server.allowed_verbs:
+                reply = {"returncode": 126, "stdout": "", "stderr": f"Verb not allowed: {verb}"}
+            else:
+                try:
+                    result = subprocess.run(resolve(command), capture_output=True, text=True, close_fds=False)
+                    reply = {"returncode": result.returncode, "stdout": result.stdout, "stderr": result.stderr}
+                except OSError as err:
+                    reply = {"returncode": 127, "stdout": "", "stderr": str(err)}
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+class HelperServer(socketserver.ThreadingUnixStreamServer):
+    """Unix domain socket server for the helper daemon, serving only root and the allowed uids."""
+
+    daemon_threads = True
+
+    def __init__(self, path, uids=(), allowed_verbs=()):
+        self.uids = frozenset({0, *uids})
+        self.allowed_verbs = frozenset(allowed_verbs)
+        super().__init__(path, _HelperHandler)
+
+    def verify_request(self, request, client_address):
+        """Drop connections from any other user, whatever the socket's file permissions."""
+        try:
+            return peer_uid(request) in self.uids
+        except OSError:
+            return False
+
+
+def serve(path=DEFAULT_SOCKET, user=None, allow_reboot=False, allow_shutdown=False):
+    """Create a helper server listening on path, accessible only to root and, if given, user."""
+    if os.path.exists(path):
+        os.unlink(path)
+    uids = () if user is None else (_lookup_uid(user),)
+    allowed_verbs = {verb for verb, allowed in (("REBOOT", allow_reboot), ("SHUTDOWN", allow_shutdown)) if allowed}
+    # Create the socket owner-only, then hand it to the user
+    umask = os.umask(0o177)
+    try:
+        server = HelperServer(path, uids, allowed_verbs)
+    finally:
+        os.umask(umask)
+    if uids:
+        os.chown(path, uids[0], -1)
+    return server
+
+
+def main():
+    """Run the helper daemon."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Path of the Unix domain socket to listen on")
+    parser.add_argument("--user", help="User allowed to use the helper besides root, i.e. the user running OVOS")
+    parser.add_argument("--allow-reboot", action="store_true", help="Run REBOOT requests")
+    parser.add_argument("--allow-shutdown", action="store_true", help="Run SHUTDOWN requests")
+    args = parser.parse_args()
+    with serve(args.socket, args.user, args.allow_reboot, args.allow_shutdown) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Client for the macOS PHAL plugin's helper daemon, kept apart from the daemon so the plugin doesn't import it."""
+
+import json
+import socket
+
+DEFAULT_SOCKET = "/var/run/ovos-mac.sock"
+DEFAULT_TIMEOUT = 30
+
+
+class HelperUnavailableError(OSError):
+    """Raised when the helper daemon can't be connected to, so nothing was sent to it."""
+
+
+class HelperClient:
+    """Client for the helper daemon. Each call uses its own connection, so calls can run concurrently."""
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=DEFAULT_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+
+    def run(self, verb):
+        """Run a helper verb, returning a (returncode, stdout, stderr) tuple.
+
+        Raises HelperUnavailableError if the helper can't be connected to; the caller may run the command itself
+        instead. Raises OSError if the helper fails or doesn't reply in time after the verb was sent, since it may
+        already have run the command.
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                try:
+                    sock.connect(self.path)
+                except OSError as err:
+                    raise HelperUnavailableError(f"Helper at {self.path} unavailable: {err}") from err
+                sock.sendall(f"{verb}\n".encode("utf-8"))
+                with sock.makefile("r", encoding="utf-8") as reader:
+                    line = reader.readline()
+            if not line:
+                raise ConnectionError("Helper closed the connection")
+            reply = json.loads(line)
+        except HelperUnavailableError:
+            raise
+        except (OSError, ValueError) as err:
+            raise OSError(f"Helper at {self.path} failed: {err}") from err
+        return reply["returncode"], reply["stdout"], reply["stderr"]
@@ -0,0 +1,62 @@
+# pylint: disable=missing-docstring,redefined-outer-name,protected-access
+import sys
+
+import pytest
+
+from phal_plugin_mac.applescript import AppleScriptWorker
+
+# Stand-in for the JXA worker that speaks the same line protocol
+ECHO_WORKER = """
+import json, sys
+for line in sys.stdin:
+    source, *args = json.loads(line)
+    if source == "exit":
+        break
+    if source == "fail":
+        reply = {"error": {"NSAppleScriptErrorMessage": "boom"}}
+    else:
+        reply = {"result": " ".join([source, *args]).upper()}
+    sys.stdout.write(json.dumps(reply) + "\\n")
+    sys.stdout.flush()
+"""
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(AppleScriptWorker, "command", [sys.executable, "-c", ECHO_WORKER])
+    worker = AppleScriptWorker()
+    yield worker
+    worker.close()
+
+
+def test_worker_reuses_process(worker):
+    assert worker.run("one") == (None, "ONE")
+    proc = worker._proc
+    assert worker.run("two\nlines") == (None, "TWO\nLINES")
+    assert worker._proc is proc
+
+
+def test_worker_args(worker):
+    assert worker.run("volume", 75) == (None, "VOLUME 75")
+    assert worker.run("mute", "true") == (None, "MUTE TRUE")
+
+
+def test_worker_error(worker):
+    error, result = worker.run("fail")
+    assert error == {"NSAppleScriptErrorMessage": "boom"}
+    assert result is None
+
+
+def test_worker_restarts_after_exit(worker):
+    with pytest.raises(EOFError):
+        worker.run("exit")
+    assert worker._proc is None
+    assert worker.run("again") == (None, "AGAIN")
+
+
+def test_worker_close(worker):
+    worker.run("one")
+    proc = worker._proc
+    worker.close()
+    assert worker._proc is None
+    assert proc.poll() is not None
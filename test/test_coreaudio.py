@@ -0,0 +1,97 @@
+# pylint: disable=missing-docstring,redefined-outer-name,protected-access,invalid-name
+import sys
+
+import pytest
+
+from phal_plugin_mac.coreaudio import _DEFAULT_OUTPUT_DEVICE, _MUTE, _VIRTUAL_MAIN_VOLUME, _VOLUME_SCALAR, CoreAudio
+
+
+class FakeHAL:
+    """In-memory stand-in for the CoreAudio and AudioToolbox property functions used by CoreAudio."""
+
+    def __init__(self, elements, virtual=False):
+        self.device = 73
+        self.properties = {(1, _DEFAULT_OUTPUT_DEVICE, 0): self.device}
+        for element in elements:
+            self.properties[(self.device, _VOLUME_SCALAR, element)] = 0.5
+            self.properties[(self.device, _MUTE, element)] = 0
+        if virtual:
+            self.properties[(self.device, _VIRTUAL_MAIN_VOLUME, 0)] = 0.5
+
+    def AudioObjectHasProperty(self, object_id, address):
+        return (object_id, address.mSelector, address.mElement) in self.properties
+
+    def AudioObjectGetPropertyData(self, object_id, address, _qualifier_size, _qualifier, _size, data):
+        key = (object_id, address._obj.mSelector, address._obj.mElement)
+        if key not in self.properties:
+            return -1
+        data._obj.value = self.properties[key]
+        return 0
+
+    def AudioObjectSetPropertyData(self, object_id, address, _qualifier_size, _qualifier, _size, data):
+        self.properties[(object_id, address._obj.mSelector, address._obj.mElement)] = data._obj.value
+        return 0
+
+    AudioHardwareServiceHasProperty = AudioObjectHasProperty
+    AudioHardwareServiceGetPropertyData = AudioObjectGetPropertyData
+    AudioHardwareServiceSetPropertyData = AudioObjectSetPropertyData
+
+
+def make_audio(hal):
+    return CoreAudio(lib=hal, toolbox=hal)
+
+
+@pytest.mark.parametrize("elements", [(0,), (1, 2)])
+def test_volume(elements):
+    hal = FakeHAL(elements)
+    audio = make_audio(hal)
+
+    assert audio.get_volume() == 50
+    assert audio.set_volume(75) == 75
+    assert audio.get_volume() == 75
+    for element in elements:
+        assert hal.properties[(hal.device, _VOLUME_SCALAR, element)] == pytest.approx(0.75)
+
+
+def test_volume_virtual_main():
+    hal = FakeHAL((1, 2), virtual=True)
+    audio = make_audio(hal)
+
+    assert audio.set_volume(80) == 80
+    assert audio.get_volume() == 80
+    assert hal.properties[(hal.device, _VIRTUAL_MAIN_VOLUME, 0)] == pytest.approx(0.8)
+    # The system balances the channels itself, so they are left alone
+    assert hal.properties[(hal.device, _VOLUME_SCALAR, 1)] == pytest.approx(0.5)
+
+
+def test_volume_keeps_channel_balance():
+    hal = FakeHAL((1, 2))
+    hal.properties[(hal.device, _VOLUME_SCALAR, 1)] = 0.8
+    hal.properties[(hal.device, _VOLUME_SCALAR, 2)] = 0.4
+    audio = make_audio(hal)
+
+    assert audio.get_volume() == 80
+    assert audio.set_volume(50) == 50
+    assert hal.properties[(hal.device, _VOLUME_SCALAR, 1)] == pytest.approx(0.5)
+    assert hal.properties[(hal.device, _VOLUME_SCALAR, 2)] == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("elements", [(0,), (1, 2)])
+def test_mute(elements):
+    audio = make_audio(FakeHAL(elements))
+
+    assert audio.is_muted() is False
+    assert audio.set_mute(True) is True
+    assert audio.is_muted() is True
+
+
+def test_no_volume_control():
+    audio = make_audio(FakeHAL(()))
+    with pytest.raises(OSError):
+        audio.get_volume()
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="CoreAudio is available on macOS")
+def test_unavailable():
+    with pytest.raises(OSError):
+        CoreAudio()
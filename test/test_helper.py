@@ -0,0 +1,127 @@
+# pylint: disable=missing-docstring,redefined-outer-name,protected-access
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+from phal_plugin_mac import helper
+from phal_plugin_mac.helper import peer_uid, serve
+from phal_plugin_mac.helper_client import HelperClient, HelperUnavailableError
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters, which pytest's tmp_path can exceed on macOS
+    directory = tempfile.mkdtemp(prefix="ovos-mac-", dir="/tmp")
+    yield os.path.join(directory, "helper.sock")
+    shutil.rmtree(directory)
+
+
+@pytest.fixture
+def make_server(socket_path, monkeypatch):
+    monkeypatch.setattr(
+        helper,
+        "HELPER_COMMANDS",
+        {
+            "SAY HI": (sys.executable, "-c", "print('hi')"),
+            "FAIL": (sys.executable, "-c", "exit(3)"),
+            "REBOOT": (sys.executable, "-c", "print('rebooting')"),
+            "SLOW": (sys.executable, "-c", "import time; time.sleep(1)"),
+        },
+    )
+    servers = []
+
+    def make_server(**kwargs):
+        # Tests don't run as root in CI, so the current user has to be let in
+        server = serve(socket_path, user=os.getuid(), **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield make_server
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server(make_server):
+    return make_server()
+
+
+def test_socket_permissions(server, socket_path):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_client_runs_verbs(server, socket_path):
+    client = HelperClient(socket_path)
+    assert client.run("SAY HI") == (0, "hi\n", "")
+    assert client.run("FAIL") == (3, "", "")
+
+
+def test_client_unknown_verb(server, socket_path):
+    client = HelperClient(socket_path)
+    returncode, _, stderr = client.run("rm -rf /")
+    assert returncode == 127
+    assert "Unknown verb" in stderr
+
+
+def test_opt_in_verbs(make_server, socket_path):
+    make_server()
+    client = HelperClient(socket_path)
+    returncode, _, stderr = client.run("REBOOT")
+    assert returncode == 126
+    assert "not allowed" in stderr
+
+
+def test_opt_in_verbs_allowed(make_server, socket_path):
+    make_server(allow_reboot=True)
+    client = HelperClient(socket_path)
+    assert client.run("REBOOT") == (0, "rebooting\n", "")
+
+
+def test_other_users_rejected(server, socket_path, monkeypatch):
+    monkeypatch.setattr(helper, "peer_uid", lambda _sock: 4242)
+    client = HelperClient(socket_path)
+    with pytest.raises(OSError):
+        client.run("SAY HI")
+
+
+def test_peer_uid():
+    left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with left, right:
+        assert peer_uid(left) == os.getuid()
+
+
+def test_client_concurrent_calls(server, socket_path):
+    client = HelperClient(socket_path)
+    slow = threading.Thread(target=client.run, args=("SLOW",))
+    slow.start()
+    time.sleep(0.1)
+    start = time.monotonic()
+    assert client.run("SAY HI") == (0, "hi\n", "")
+    assert time.monotonic() - start < 0.9
+    slow.join()
+
+
+def test_client_timeout(socket_path):
+    # A helper that accepts connections but never replies
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen()
+        client = HelperClient(socket_path, timeout=0.1)
+        with pytest.raises(OSError) as excinfo:
+            client.run("SAY HI")
+        assert not isinstance(excinfo.value, HelperUnavailableError)
+
+
+def test_client_unavailable(socket_path):
+    client = HelperClient(socket_path)
+    with pytest.raises(HelperUnavailableError):
+        client.run("SAY HI")
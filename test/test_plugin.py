@@ -1,5 +1,11 @@
 # pylint: disable=missing-docstring,redefined-outer-name,protected-access,unnecessary-lambda
+import asyncio
+import os
+import stat
 import subprocess
+import sys
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -8,6 +14,8 @@ from ovos_plugin_manager.phal import find_phal_plugins
 from ovos_utils.fakebus import FakeBus
 
 from phal_plugin_mac import MacOSPlugin
+from phal_plugin_mac.applescript import CHANGE_VOLUME_SCRIPT, SET_MUTE_SCRIPT, SET_VOLUME_SCRIPT
+from phal_plugin_mac.helper_client import HelperUnavailableError
 
 
 @pytest.fixture
@@ -18,7 +26,18 @@ def bus():
 @pytest.fixture
 def plugin(bus):
     config = {"allow_reboot": True, "allow_shutdown": True, "volume_change_interval": 10}
-    return MacOSPlugin(bus=bus, config=config)
+    plugin = MacOSPlugin(bus=bus, config=config)
+    # Keep tests off the real audio device and helper daemon; their tests install mocks
+    plugin._audio = None
+    plugin._pyobjc = None
+    plugin._helper = None
+    return plugin
+
+
+@pytest.fixture
+def pyobjc(plugin):
+    plugin._pyobjc = MagicMock()
+    return plugin._pyobjc
 
 
 @pytest.fixture
@@ -26,6 +45,13 @@ def message():
     return Message("test.message")
 
 
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
 def test_find_phal_plugins():
     plugins = find_phal_plugins()
     assert "ovos-phal-plugin-mac" in plugins
@@ -37,6 +63,56 @@ def test_init(plugin):
     assert plugin.volume_change_interval == 10
 
 
+def test_native_modules_loaded_lazily(bus):
+    plugin = MacOSPlugin(bus=bus)
+    assert "_audio" not in vars(plugin)
+    assert "_pyobjc" not in vars(plugin)
+    assert "_osa_worker" not in vars(plugin)
+
+    with patch.dict(sys.modules, {"Foundation": None}):
+        assert plugin._pyobjc is None
+    with patch("phal_plugin_mac.coreaudio.CoreAudio", side_effect=OSError("no CoreAudio")):
+        assert plugin._audio is None
+    assert vars(plugin)["_audio"] is None
+
+
+def test_no_worker_with_pyobjc(pyobjc, plugin):
+    assert plugin._osa_worker is None
+
+
+def test_shutdown_cancels_pending_volume_change(plugin, message, bus):
+    received_messages = []
+    bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
+    plugin._audio = MagicMock()
+    plugin.config["volume_batch_delay"] = 0.05
+
+    plugin.handle_volume_increase(message)
+    plugin.shutdown()
+    time.sleep(0.2)
+
+    plugin._audio.set_volume.assert_not_called()
+    assert not received_messages
+    assert plugin._vol_timer is None
+
+
+def test_shutdown_closes_worker(plugin):
+    worker = plugin._osa_worker = MagicMock()
+    plugin.shutdown()
+    worker.close.assert_called_once()
+
+
+def test_import_skips_helper_daemon():
+    code = "import sys, phal_plugin_mac; print('phal_plugin_mac.helper' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_handlers_registered(plugin, bus):
+    for event, handler in MacOSPlugin._HANDLERS:
+        assert callable(getattr(plugin, handler))
+        assert bus.ee.listeners(event)
+
+
 def test_run_command_error(plugin):
     cmd_results = plugin._run_command(["rm", "-r", "/ae5ih7srjo8g4ege5"])
     assert not isinstance(cmd_results, subprocess.CompletedProcess)
@@ -55,62 +131,119 @@ def test_get_ntp_server_error(mock_run, plugin):
     assert plugin._get_ntp_server() is None
 
 
+@patch.object(MacOSPlugin, "_run_command_async")
 @patch("phal_plugin_mac.MacOSPlugin._run_applescript")
-def test_handle_ssh_enable_request(mock_run_applescript, plugin, message, bus):
+def test_handle_ssh_enable_request(mock_run_applescript, mock_run_command_async, plugin, message, bus):
     received_messages = []
     bus.on("system.ssh.enabled", lambda m: received_messages.append(m))
 
-    plugin.handle_ssh_enable_request(message)
+    plugin.handle_ssh_enable_request(message).result(timeout=5)
 
-    mock_run_applescript.assert_called()
+    # The dialog runs in its own osascript process, leaving the shared AppleScript backends free
+    mock_run_applescript.assert_not_called()
+    dialog, enable = mock_run_command_async.await_args_list
+    assert dialog.args[0][:2] == ["osascript", "-e"] and dialog.kwargs == {"check": False}
+    assert enable.args == (["systemsetup", "-setremotelogin", "on"],)
     assert len(received_messages) == 1
 
 
+@patch.object(MacOSPlugin, "_run_command_async")
 @patch("phal_plugin_mac.MacOSPlugin._run_applescript")
-def test_handle_ssh_disable_request(mock_run_applescript, plugin, message, bus):
+def test_handle_ssh_disable_request(mock_run_applescript, mock_run_command_async, plugin, message, bus):
     received_messages = []
     bus.on("system.ssh.disabled", lambda m: received_messages.append(m))
 
-    plugin.handle_ssh_disable_request(message)
+    plugin.handle_ssh_disable_request(message).result(timeout=5)
 
-    mock_run_applescript.assert_called()
+    mock_run_applescript.assert_not_called()
+    mock_run_command_async.assert_awaited_with(["systemsetup", "-setremotelogin", "off"])
+    assert mock_run_command_async.await_count == 2
     assert len(received_messages) == 1
 
 
-def test_handle_reboot_request_not_allowed(plugin, message, bus):
+@patch("subprocess.run")
+def test_handle_reboot_request_not_allowed(mock_run, plugin, message, bus):
     plugin.config["allow_reboot"] = False
     received_messages = []
     bus.on("system.reboot.failed", lambda m: received_messages.append(m))
 
     plugin.handle_reboot_request(message)
 
+    mock_run.assert_not_called()
     assert len(received_messages) == 1
 
 
-def test_handle_shutdown_request_not_allowed(plugin, message, bus):
+@patch("subprocess.run")
+def test_handle_shutdown_request_not_allowed(mock_run, plugin, message, bus):
     plugin.config["allow_shutdown"] = False
     received_messages = []
     bus.on("system.shutdown.failed", lambda m: received_messages.append(m))
 
     plugin.handle_shutdown_request(message)
 
+    mock_run.assert_not_called()
     assert len(received_messages) == 1
 
 
-@patch.object(MacOSPlugin, "_run_command")
+@pytest.mark.parametrize(
+    "handler, verb, failed",
+    [
+        ("handle_reboot_request", "REBOOT", "system.reboot.failed"),
+        ("handle_shutdown_request", "SHUTDOWN", "system.shutdown.failed"),
+    ],
+)
+@patch("subprocess.run")
+def test_handle_power_request_refused_by_helper(mock_run, handler, verb, failed, plugin, message, bus):
+    received_messages = []
+    bus.on(failed, lambda m: received_messages.append(m))
+
+    # The helper refuses reboot and shutdown unless started with --allow-reboot/--allow-shutdown
+    plugin._helper = MagicMock()
+    plugin._helper.run.return_value = (126, "", f"{verb} is not allowed\n")
+    getattr(plugin, handler)(message)
+
+    plugin._helper.run.assert_called_once_with(verb)
+    mock_run.assert_not_called()
+    assert len(received_messages) == 1
+
+
+@patch("subprocess.run")
+def test_handle_reboot_request_error(mock_run, plugin, message, bus):
+    mock_run.return_value = subprocess.CompletedProcess(["/sbin/shutdown", "-r", "now"], 1)
+    received_messages = []
+    bus.on("system.reboot.failed", lambda m: received_messages.append(m))
+
+    plugin.handle_reboot_request(message)
+
+    assert len(received_messages) == 1
+
+
+@patch.object(MacOSPlugin, "_run_command_async")
 def test_handle_configure_language_request_error(mock_run_command, plugin, message, bus):
     mock_run_command.side_effect = subprocess.CalledProcessError(1, "language config failure")
     received_messages = []
     bus.on("system.language.configure.failed", lambda m: received_messages.append(m))
 
     message.data["lang"] = "en-US"
-    plugin.handle_configure_language_request(message)
+    plugin.handle_configure_language_request(message).result(timeout=5)
 
     assert len(received_messages) == 1
     # Optionally, check the content of the received message
     # assert received_messages[0].data == {"error": "Command execution failed"}
 
 
+@patch.object(MacOSPlugin, "_run_command_async")
+def test_handle_configure_language_request_missing_binary(mock_run_command, plugin, message, bus):
+    mock_run_command.side_effect = FileNotFoundError("/usr/bin/defaults")
+    received_messages = []
+    bus.on("system.language.configure.failed", lambda m: received_messages.append(m))
+
+    message.data["lang"] = "en-US"
+    plugin.handle_configure_language_request(message).result(timeout=5)
+
+    assert len(received_messages) == 1
+
+
 @patch.object(MacOSPlugin, "_run_command")
 def test_handle_mycroft_restart_request_error(mock_run_command, plugin, message, bus):
     mock_run_command.side_effect = subprocess.CalledProcessError(1, "mycroft restart request error")
@@ -121,47 +254,250 @@ def test_handle_mycroft_restart_request_error(mock_run_command, plugin, message,
     assert len(received_messages) == 1
 
 
-@patch.object(MacOSPlugin, "_run_command")
+@patch.object(MacOSPlugin, "_run_command_async")
 def test_handle_ntp_sync_request_error(mock_run_command, plugin, message, bus):
     mock_run_command.side_effect = subprocess.CalledProcessError(1, "ntp sync request error")
     received_messages = []
     bus.on("system.ntp.sync.failed", lambda m: received_messages.append(m))
 
-    plugin.handle_ntp_sync_request(message)
+    plugin.handle_ntp_sync_request(message).result(timeout=5)
 
     assert len(received_messages) == 1
 
 
-@patch.object(MacOSPlugin, "_run_command")
-def test_handle_ssh_enable_request_error(mock_run_command, plugin, message, bus):
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+@patch.object(MacOSPlugin, "_run_command_async")
+def test_handle_ssh_enable_request_error(mock_run_command, _mock_run_applescript, plugin, message, bus):
     mock_run_command.side_effect = subprocess.CalledProcessError(1, "ssh enable request error")
     received_messages = []
     bus.on("system.ssh.enable.failed", lambda m: received_messages.append(m))
 
-    plugin.handle_ssh_enable_request(message)
+    plugin.handle_ssh_enable_request(message).result(timeout=5)
 
     assert len(received_messages) == 1
 
 
-@patch.object(MacOSPlugin, "_run_command")
-def test_handle_ssh_disable_request_error(mock_run_command, plugin, message, bus):
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+@patch.object(MacOSPlugin, "_run_command_async")
+def test_handle_ssh_disable_request_error(mock_run_command, _mock_run_applescript, plugin, message, bus):
     mock_run_command.side_effect = subprocess.CalledProcessError(1, "ssh disable request error")
     received_messages = []
     bus.on("system.ssh.disable.failed", lambda m: received_messages.append(m))
 
-    plugin.handle_ssh_disable_request(message)
+    plugin.handle_ssh_disable_request(message).result(timeout=5)
 
     assert len(received_messages) == 1
 
 
+def test_run_command_async(plugin):
+    assert plugin._submit(plugin._run_command_async([sys.executable, "-c", "pass"])).result(timeout=5) == 0
+    with pytest.raises(subprocess.CalledProcessError):
+        plugin._submit(plugin._run_command_async([sys.executable, "-c", "exit(3)"])).result(timeout=5)
+
+
+def test_shutdown_stops_loop(plugin):
+    plugin._submit(plugin._run_command_async([sys.executable, "-c", "pass"])).result(timeout=5)
+    loop = plugin._loop
+    pending = plugin._submit(asyncio.sleep(60))
+    plugin.shutdown()
+    assert wait_for(lambda: loop.is_closed())
+    assert plugin._loop is None
+    assert pending.cancelled()
+
+    # Work submitted after shutdown gets a fresh loop rather than a future that never resolves
+    assert plugin._submit(plugin._run_command_async([sys.executable, "-c", "pass"])).result(timeout=5) == 0
+    plugin.shutdown()
+
+
 @patch("subprocess.run")
 def test_run_command(mock_run, plugin):
     mock_run.return_value = MagicMock(stdout="test output")
     result = plugin._run_command(["test", "command"])
-    mock_run.assert_called_once_with(["test", "command"], check=True, capture_output=True, text=True)
+    mock_run.assert_called_once_with(["test", "command"], check=True, capture_output=True, text=True, close_fds=False)
     assert result.stdout == "test output"
 
 
+@patch("subprocess.run")
+def test_run_command_without_capture(mock_run, plugin):
+    plugin._run_command(["test", "command"], capture=False)
+    mock_run.assert_called_once_with(
+        ["test", "command"], check=True, close_fds=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def test_run_applescript_osakit(pyobjc, plugin):
+    compiled = pyobjc.OSAScript.alloc.return_value.initWithSource_language_.return_value
+    compiled.compileAndReturnError_.return_value = (True, None)
+    compiled.executeAndReturnError_.return_value = (MagicMock(stringValue=lambda: "50"), None)
+
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+
+    compiled.compileAndReturnError_.assert_called_once()
+    assert compiled.executeAndReturnError_.call_count == 2
+
+
+def test_run_applescript_osakit_error(pyobjc, plugin):
+    compiled = pyobjc.OSAScript.alloc.return_value.initWithSource_language_.return_value
+    compiled.compileAndReturnError_.return_value = (True, None)
+    compiled.executeAndReturnError_.return_value = (None, {"NSAppleScriptErrorMessage": "boom"})
+
+    assert plugin._run_applescript("output volume of (get volume settings)") is None
+
+
+def test_run_applescript_nsapplescript(pyobjc, plugin):
+    pyobjc.OSAScript = None
+    compiled = pyobjc.NSAppleScript.alloc.return_value.initWithSource_.return_value
+    compiled.compileAndReturnError_.return_value = (True, None)
+    compiled.executeAndReturnError_.return_value = (MagicMock(stringValue=lambda: "true"), None)
+
+    assert plugin._run_applescript("output muted of (get volume settings)") == "true"
+    assert plugin._run_applescript("output muted of (get volume settings)") == "true"
+
+    pyobjc.NSAppleScript.alloc.return_value.initWithSource_.assert_called_once_with(
+        "output muted of (get volume settings)"
+    )
+    assert compiled.executeAndReturnError_.call_count == 2
+
+
+def test_run_applescript_with_args(pyobjc, plugin):
+    pyobjc.OSAScript = None
+    mock_descriptor = pyobjc.NSAppleEventDescriptor
+    compiled = pyobjc.NSAppleScript.alloc.return_value.initWithSource_.return_value
+    compiled.compileAndReturnError_.return_value = (True, None)
+    compiled.executeAppleEvent_error_.return_value = (MagicMock(stringValue=lambda: ""), None)
+    argv = mock_descriptor.listDescriptor.return_value
+    event = mock_descriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_.return_value
+
+    assert plugin._run_applescript(SET_VOLUME_SCRIPT, 30) == ""
+    assert plugin._run_applescript(SET_VOLUME_SCRIPT, 70) == ""
+
+    pyobjc.NSAppleScript.alloc.return_value.initWithSource_.assert_called_once_with(SET_VOLUME_SCRIPT)
+    compiled.executeAndReturnError_.assert_not_called()
+    assert compiled.executeAppleEvent_error_.call_args_list == [((event, None),), ((event, None),)]
+    assert mock_descriptor.descriptorWithString_.call_args_list == [(("30",),), (("70",),)]
+    argv.insertDescriptor_atIndex_.assert_called_with(mock_descriptor.descriptorWithString_.return_value, 1)
+    event.setParamDescriptor_forKeyword_.assert_called_with(argv, 0x2D2D2D2D)
+
+
+def test_run_applescript_worker(plugin):
+    plugin._osa_worker = MagicMock()
+    plugin._osa_worker.run.return_value = (None, "50")
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    plugin._osa_worker.run.assert_called_once_with("output volume of (get volume settings)")
+
+    plugin._osa_worker.run.return_value = ({"NSAppleScriptErrorMessage": "boom"}, None)
+    assert plugin._run_applescript("output volume of (get volume settings)") is None
+
+
+@patch("subprocess.run")
+def test_run_applescript_worker_failure(mock_run, plugin):
+    plugin._osa_worker = MagicMock()
+    plugin._osa_worker.run.side_effect = EOFError("AppleScript worker exited")
+    mock_run.return_value = subprocess.CompletedProcess([], 0, "50\n", "")
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    mock_run.assert_called_once()
+
+
+@patch("subprocess.run")
+def test_run_applescript_fallback(mock_run, plugin):
+    plugin._osa_worker = None
+    mock_run.return_value = subprocess.CompletedProcess([], 0, "50\n", "")
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    mock_run.assert_called_once_with(
+        ["/usr/bin/osascript", "-e", "output volume of (get volume settings)"],
+        check=False,
+        capture_output=True,
+        text=True,
+        close_fds=False,
+    )
+
+
+@patch("subprocess.run")
+def test_run_applescript_fallback_with_args(mock_run, plugin):
+    plugin._osa_worker = None
+    mock_run.return_value = subprocess.CompletedProcess([], 0, "\n", "")
+    assert plugin._run_applescript(SET_VOLUME_SCRIPT, 75) == ""
+    assert mock_run.call_args[0][0] == ["/usr/bin/osascript", "-e", SET_VOLUME_SCRIPT, "75"]
+
+
+@patch("subprocess.run")
+def test_run_applescript_fallback_error(mock_run, plugin):
+    plugin._osa_worker = None
+    mock_run.return_value = subprocess.CompletedProcess([], 1, "", "execution error")
+    assert plugin._run_applescript("output volume of (get volume settings)") is None
+
+
+def fake_osacompile(returncode=0, delay=0):
+    def run(command, **_kwargs):
+        if command[0] == "/usr/bin/osacompile":
+            time.sleep(delay)
+            open(command[2], "w").close()
+            if returncode:
+                raise subprocess.CalledProcessError(returncode, command)
+            return subprocess.CompletedProcess(command, returncode)
+        return subprocess.CompletedProcess(command, 0, "50\n", "")
+
+    return run
+
+
+@patch("subprocess.run")
+def test_run_applescript_precompiled(mock_run, plugin):
+    plugin._osa_worker = None
+    plugin._scpt = {}
+    mock_run.side_effect = fake_osacompile()
+
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+
+    commands = [args[0] for args, _ in mock_run.call_args_list]
+    assert len(commands) == 3
+    assert commands[0][:2] == ["/usr/bin/osacompile", "-o"]
+    # Compiled under a temporary name, then moved into place in a directory only we can write to
+    directory = plugin._scpt_dir
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert os.stat(directory).st_uid == os.getuid()
+    assert os.path.dirname(commands[0][2]) == directory
+    path = commands[1][1]
+    assert os.path.dirname(path) == directory and path.endswith(".scpt") and path != commands[0][2]
+    assert commands[1] == commands[2] == ["/usr/bin/osascript", path]
+    assert sorted(os.listdir(directory)) == [os.path.basename(path)]
+
+    plugin.shutdown()
+    assert not os.path.exists(directory)
+
+
+@patch("subprocess.run")
+def test_run_applescript_precompile_failure(mock_run, plugin):
+    plugin._osa_worker = None
+    plugin._scpt = {}
+    mock_run.side_effect = fake_osacompile(returncode=1)
+
+    # The partial output of a failed compile is never run; the source is passed to osascript instead
+    assert plugin._run_applescript("output volume of (get volume settings)") == "50"
+    assert mock_run.call_args[0][0] == ["/usr/bin/osascript", "-e", "output volume of (get volume settings)"]
+    assert not [name for name in os.listdir(plugin._scpt_dir) if not name.endswith(".partial.scpt")]
+
+
+@patch("subprocess.run")
+def test_run_applescript_precompile_concurrent(mock_run, plugin):
+    plugin._osa_worker = None
+    plugin._scpt = {}
+    mock_run.side_effect = fake_osacompile(delay=0.1)
+
+    threads = [
+        threading.Thread(target=plugin._run_applescript, args=("output volume of (get volume settings)",))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    compiles = [args[0] for args, _ in mock_run.call_args_list if args[0][0] == "/usr/bin/osacompile"]
+    assert len(compiles) == 1
+
+
 @patch("phal_plugin_mac.MacOSPlugin._run_applescript")
 def test_get_volume(mock_run_applescript, plugin):
     mock_run_applescript.return_value = 50
@@ -170,17 +506,99 @@ def test_get_volume(mock_run_applescript, plugin):
     assert volume == 50
 
 
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_get_volume_cached(mock_run_applescript, plugin):
+    mock_run_applescript.return_value = "50"
+    assert plugin._get_volume() == 50
+    assert plugin._get_volume() == 50
+    mock_run_applescript.assert_called_once()
+
+    plugin._set_volume(75)
+    mock_run_applescript.return_value = "75"
+    assert plugin._get_volume() == 75
+    assert mock_run_applescript.call_count == 3
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_get_volume_cache_disabled(mock_run_applescript, plugin):
+    plugin.config["volume_cache_ttl"] = 0
+    mock_run_applescript.return_value = "50"
+    plugin._get_volume()
+    plugin._get_volume()
+    assert mock_run_applescript.call_count == 2
+
+
 @patch("phal_plugin_mac.MacOSPlugin._run_applescript")
 def test_set_volume(mock_run_applescript, plugin):
     plugin._set_volume(75)
-    mock_run_applescript.assert_called_once_with("set volume output volume 75")
+    mock_run_applescript.assert_called_once_with(SET_VOLUME_SCRIPT, 75)
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_set_mute(mock_run_applescript, plugin):
+    plugin._set_mute(True)
+    plugin._set_mute(False)
+    assert mock_run_applescript.call_args_list == [
+        ((SET_MUTE_SCRIPT, "true"),),
+        ((SET_MUTE_SCRIPT, "false"),),
+    ]
 
 
 @patch("phal_plugin_mac.MacOSPlugin._run_applescript")
 def test_is_muted(mock_run_applescript, plugin):
     mock_run_applescript.return_value = "true"
     assert plugin._is_muted() is True
-    mock_run_applescript.assert_called_once_with("output muted of (get volume settings)")
+    mock_run_applescript.assert_called_once_with("(output muted of (get volume settings)) as text")
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_volume_coreaudio(mock_run_applescript, plugin):
+    plugin._audio = MagicMock()
+    plugin._audio.get_volume.return_value = 95
+    plugin._audio.set_volume.side_effect = lambda volume: volume
+    plugin._audio.is_muted.return_value = False
+    plugin._audio.set_mute.side_effect = lambda mute: mute
+
+    assert plugin._get_volume() == 95
+    assert plugin._is_muted() is False
+    assert plugin._change_volume(10) == (95, 100)
+    plugin._audio.set_volume.assert_called_once_with(100)
+    plugin._vol_cache = (0.0, None)
+    plugin._audio.get_volume.return_value = 100
+    assert plugin._change_volume(10) == (100, 100)
+    plugin._audio.set_volume.assert_called_once()
+    assert plugin._toggle_mute() is True
+    plugin._audio.set_mute.assert_called_once_with(True)
+    mock_run_applescript.assert_not_called()
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_volume_coreaudio_failure(mock_run_applescript, plugin):
+    plugin._audio = MagicMock()
+    plugin._audio.get_volume.side_effect = OSError("no volume control")
+    mock_run_applescript.return_value = "50"
+
+    assert plugin._get_volume() == 50
+    mock_run_applescript.assert_called_once_with("output volume of (get volume settings)")
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_is_muted_cached(mock_run_applescript, plugin):
+    mock_run_applescript.return_value = "true"
+    assert plugin._is_muted() is True
+    assert plugin._is_muted() is True
+    mock_run_applescript.assert_called_once()
+
+    plugin._set_mute(False)
+    mock_run_applescript.return_value = "false"
+    assert plugin._is_muted() is False
+    assert mock_run_applescript.call_count == 3
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_is_muted_false(mock_run_applescript, plugin):
+    mock_run_applescript.return_value = "false\n"
+    assert plugin._is_muted() is False
 
 
 @patch("phal_plugin_mac.MacOSPlugin._set_volume")
@@ -196,34 +614,140 @@ def test_handle_volume_set(mock_set_volume, plugin, message, bus):
     assert received_messages[0].data["percent"] == 60
 
 
-@patch("phal_plugin_mac.MacOSPlugin._get_volume")
 @patch("phal_plugin_mac.MacOSPlugin._set_volume")
-def test_handle_volume_decrease(mock_set_volume, mock_get_volume, plugin, message, bus):
+def test_handle_volume_set_mutating_subscriber(mock_set_volume, plugin, message, bus):
+    # In-process subscribers get the emitted data as-is, so one that mutates it must not affect later confirms
+    received = []
+
+    def mutate(m):
+        received.append(dict(m.data))
+        m.data["percent"] = 0
+
+    bus.on("mycroft.volume.set.confirm", mutate)
+
+    message.data["percent"] = 60
+    plugin.handle_volume_set(message)
+    plugin.handle_volume_set(message)
+
+    assert received == [{"percent": 60}, {"percent": 60}]
+    assert mock_set_volume.call_count == 2
+
+
+@patch("phal_plugin_mac.MacOSPlugin._set_volume")
+def test_handle_volume_set_unchanged(mock_set_volume, plugin, message, bus):
     received_messages = []
     bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
 
-    mock_get_volume.return_value = 50
+    plugin._vol_cache = (time.monotonic(), 60)
+    message.data["percent"] = 60
+    plugin.handle_volume_set(message)
+
+    mock_set_volume.assert_not_called()
+    assert not received_messages
+
+
+def test_handle_volume_set_cancels_pending_change(plugin, message):
+    state = {"volume": 50}
+    plugin._audio = MagicMock()
+    plugin._audio.get_volume.side_effect = lambda: state["volume"]
+    plugin._audio.set_volume.side_effect = lambda volume: state.update(volume=volume) or volume
+    plugin.config["volume_batch_delay"] = 0.05
+
+    plugin.handle_volume_increase(message)
+    plugin.handle_volume_set(Message("mycroft.volume.set", {"percent": 30}))
+    time.sleep(0.2)
+
+    assert state["volume"] == 30
+    assert plugin._vol_timer is None
+    assert plugin._pending_vol_delta == 0
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_change_volume(mock_run_applescript, plugin):
+    mock_run_applescript.return_value = "50 60"
+    assert plugin._change_volume(10) == (50, 60)
+    mock_run_applescript.assert_called_once_with(CHANGE_VOLUME_SCRIPT, 10)
+    assert "if n is not v then set volume output volume n" in CHANGE_VOLUME_SCRIPT
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_decrease(mock_run_applescript, plugin, message, bus):
+    received_messages = []
+    bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
+
+    mock_run_applescript.return_value = "50 40"
     plugin.handle_volume_decrease(message)
 
-    mock_set_volume.assert_called_once_with(40)
+    assert wait_for(lambda: received_messages)
+    mock_run_applescript.assert_called_once()
+    assert mock_run_applescript.call_args[0] == (CHANGE_VOLUME_SCRIPT, -10)
     assert len(received_messages) == 1
     assert received_messages[0].data["percent"] == 40
 
 
-@patch("phal_plugin_mac.MacOSPlugin._get_volume")
-@patch("phal_plugin_mac.MacOSPlugin._set_volume")
-def test_handle_volume_increase(mock_set_volume, mock_get_volume, plugin, message, bus):
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_increase(mock_run_applescript, plugin, message, bus):
     received_messages = []
     bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
 
-    mock_get_volume.return_value = 50
+    mock_run_applescript.return_value = "50 60"
     plugin.handle_volume_increase(message)
 
-    mock_set_volume.assert_called_once_with(60)
+    assert wait_for(lambda: received_messages)
+    mock_run_applescript.assert_called_once()
+    assert mock_run_applescript.call_args[0] == (CHANGE_VOLUME_SCRIPT, 10)
     assert len(received_messages) == 1
     assert received_messages[0].data["percent"] == 60
 
 
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_increase_at_max(mock_run_applescript, plugin, message, bus):
+    received_messages = []
+    bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
+
+    plugin.config["volume_batch_delay"] = 0.2
+    mock_run_applescript.return_value = "100 100"
+    plugin.handle_volume_increase(message)
+    plugin._vol_timer.join()
+
+    mock_run_applescript.assert_called_once()
+    assert not received_messages
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_increase_burst(mock_run_applescript, plugin, message, bus):
+    received_messages = []
+    bus.on("mycroft.volume.set.confirm", lambda m: received_messages.append(m))
+    plugin.config["volume_batch_delay"] = 0.2
+
+    mock_run_applescript.return_value = "60 80"
+    plugin.handle_volume_increase(message)
+    plugin.handle_volume_increase(message)
+    plugin.handle_volume_decrease(message)
+    plugin.handle_volume_increase(message)
+
+    assert wait_for(lambda: received_messages)
+    mock_run_applescript.assert_called_once()
+    assert mock_run_applescript.call_args[0] == (CHANGE_VOLUME_SCRIPT, 20)
+    assert len(received_messages) == 1
+    assert received_messages[0].data["percent"] == 80
+
+
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_mute_keeps_pending_volume_change(mock_run_applescript, plugin, message):
+    plugin.config["volume_batch_delay"] = 60
+    plugin.handle_volume_increase(message)
+    lock, timer = plugin._vol_lock, plugin._vol_timer
+
+    plugin._set_mute(True)
+    plugin._toggle_mute()
+
+    assert plugin._vol_lock is lock
+    assert plugin._vol_timer is timer
+    assert plugin._pending_vol_delta == 10
+    timer.cancel()
+
+
 @patch("phal_plugin_mac.MacOSPlugin._set_mute")
 def test_handle_volume_mute(mock_set_mute, plugin, message, bus):
     received_messages = []
@@ -248,33 +772,92 @@ def test_handle_volume_unmute(mock_set_mute, plugin, message, bus):
     assert not received_messages[0].data["muted"]
 
 
-@patch("phal_plugin_mac.MacOSPlugin._is_muted")
-@patch("phal_plugin_mac.MacOSPlugin._set_mute")
-def test_handle_volume_mute_toggle(mock_set_mute, mock_is_muted, plugin, message, bus):
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_mute_toggle(mock_run_applescript, plugin, message, bus):
     received_messages = []
     bus.on("mycroft.volume.mute.confirm", lambda m: received_messages.append(m))
 
-    mock_is_muted.return_value = True
+    mock_run_applescript.return_value = "false"
     plugin.handle_volume_mute_toggle(message)
 
-    mock_set_mute.assert_called_once_with(False)
+    mock_run_applescript.assert_called_once()
+    assert "return m as text" in mock_run_applescript.call_args[0][0]
     assert len(received_messages) == 1
     assert not received_messages[0].data["muted"]
 
 
-@patch("subprocess.run")
-def test_handle_ntp_sync_request(mock_run, plugin, message, bus):
+@patch("phal_plugin_mac.MacOSPlugin._run_applescript")
+def test_handle_volume_mute_toggle_error(mock_run_applescript, plugin, message, bus):
+    received_messages = []
+    bus.on("mycroft.volume.mute.confirm", lambda m: received_messages.append(m))
+
+    mock_run_applescript.return_value = None
+    plugin.handle_volume_mute_toggle(message)
+
+    assert plugin._toggle_mute() is None
+    assert not received_messages
+
+
+@patch.object(MacOSPlugin, "_run_command_async")
+def test_handle_ntp_sync_request(mock_run_command_async, plugin, message, bus):
     received_messages = []
     bus.on("system.ntp.sync.complete", lambda m: received_messages.append(m))
 
-    mock_run.return_value = MagicMock(stdout="Network Time Server: time.apple.com\n")
-    plugin.handle_ntp_sync_request(message)
+    plugin.handle_ntp_sync_request(message).result(timeout=5)
 
-    mock_run.assert_any_call(["systemsetup", "-getnetworktimeserver"], check=True, capture_output=True, text=True)
-    mock_run.assert_any_call(["sntp", "-sS", "time.apple.com"], check=True, capture_output=True, text=True)
+    mock_run_command_async.assert_awaited_once_with(
+        ["/bin/sh", "-c", "/usr/bin/sntp -sS \"$(/usr/sbin/systemsetup -getnetworktimeserver | sed 's/.*: //')\""]
+    )
     assert len(received_messages) == 1
 
 
+@patch("subprocess.run")
+def test_handle_ssh_status_helper(mock_run, plugin, message, bus):
+    received_messages = []
+    bus.on("system.ssh.status.response", lambda m: received_messages.append(m))
+
+    plugin._helper = MagicMock()
+    plugin._helper.run.return_value = (0, "Remote Login: On\n", "")
+    plugin.handle_ssh_status(message)
+
+    plugin._helper.run.assert_called_once_with("SSH STATUS")
+    mock_run.assert_not_called()
+    assert received_messages[0].data["enabled"] is True
+
+
+@patch("subprocess.run")
+def test_run_command_helper_unavailable(mock_run, plugin):
+    plugin._helper = MagicMock()
+    plugin._helper.run.side_effect = HelperUnavailableError("no helper")
+    plugin._run_command(["shutdown", "-r", "now"], capture=False)
+    plugin._helper.run.assert_called_once_with("REBOOT")
+    mock_run.assert_called_once()
+
+
+@patch("asyncio.create_subprocess_exec")
+def test_handle_ntp_sync_request_helper_timeout(mock_exec, plugin, message, bus):
+    received_messages = []
+    bus.on("system.ntp.sync.complete", lambda m: received_messages.append(m))
+    bus.on("system.ntp.sync.failed", lambda m: received_messages.append(m))
+
+    plugin._helper = MagicMock()
+    plugin._helper.run.side_effect = OSError("Helper at /var/run/ovos-mac.sock failed: timed out")
+    plugin.handle_ntp_sync_request(message).result(timeout=5)
+
+    # The helper may have synced the clock already, so the command isn't run again
+    plugin._helper.run.assert_called_once_with("NTP SYNC")
+    mock_exec.assert_not_called()
+    assert [m.msg_type for m in received_messages] == ["system.ntp.sync.failed"]
+
+
+def test_run_command_async_helper(plugin):
+    plugin._helper = MagicMock()
+    plugin._helper.run.return_value = (1, "", "not permitted")
+    with pytest.raises(subprocess.CalledProcessError):
+        plugin._submit(plugin._run_command_async(["systemsetup", "-setremotelogin", "on"])).result(timeout=5)
+    plugin._helper.run.assert_called_once_with("SSH ON")
+
+
 @patch("subprocess.run")
 def test_handle_ssh_status(mock_run, plugin, message, bus):
     received_messages = []
@@ -283,7 +866,13 @@ def test_handle_ssh_status(mock_run, plugin, message, bus):
     mock_run.return_value = MagicMock(stdout="Remote Login: On\n")
     plugin.handle_ssh_status(message)
 
-    mock_run.assert_called_once_with(["systemsetup", "-getremotelogin"], check=True, capture_output=True, text=True)
+    mock_run.assert_called_once_with(
+        ["/usr/sbin/systemsetup", "-getremotelogin"],
+        check=True,
+        capture_output=True,
+        text=True,
+        close_fds=False,
+    )
     assert len(received_messages) == 1
     assert received_messages[0].data["enabled"] is True
 
@@ -291,40 +880,63 @@ def test_handle_ssh_status(mock_run, plugin, message, bus):
 @patch("subprocess.run")
 def test_handle_reboot_request(mock_run, plugin, message):
     plugin.handle_reboot_request(message)
-    mock_run.assert_called_once_with(["shutdown", "-r", "now"], check=True, capture_output=True, text=True)
+    mock_run.assert_called_once_with(
+        ["/sbin/shutdown", "-r", "now"],
+        check=False,
+        close_fds=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 @patch("subprocess.run")
 def test_handle_shutdown_request(mock_run, plugin, message):
     plugin.handle_shutdown_request(message)
-    mock_run.assert_called_once_with(["shutdown", "-h", "now"], check=True, capture_output=True, text=True)
+    mock_run.assert_called_once_with(
+        ["/sbin/shutdown", "-h", "now"],
+        check=False,
+        close_fds=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
-@patch("subprocess.run")
-def test_handle_configure_language_request(mock_run, plugin, message, bus):
+@patch.object(MacOSPlugin, "_run_command_async")
+def test_handle_configure_language_request(mock_run_command_async, plugin, message, bus):
     received_messages = []
     bus.on("system.language.configured", lambda m: received_messages.append(m))
 
     message.data["lang"] = "en-US"
-    plugin.handle_configure_language_request(message)
+    plugin.handle_configure_language_request(message).result(timeout=5)
 
-    mock_run.assert_called_once_with(
-        ["defaults", "write", "NSGlobalDomain", "AppleLanguages", '("en-US")'],
-        check=True,
-        capture_output=True,
-        text=True,
+    mock_run_command_async.assert_awaited_once_with(
+        ["defaults", "write", "NSGlobalDomain", "AppleLanguages", '("en-US")']
     )
     assert len(received_messages) == 1
     assert received_messages[0].data["lang"] == "en-US"
 
 
+@pytest.mark.parametrize(
+    "service_target, expected",
+    [
+        (None, f"gui/{os.getuid()}/com.ovos.service"),
+        ("system/com.example.ovos", "system/com.example.ovos"),
+    ],
+)
 @patch("subprocess.run")
-def test_handle_mycroft_restart_request(mock_run, plugin, message, bus):
+def test_handle_mycroft_restart_request(mock_run, service_target, expected, plugin, message, bus):
+    if service_target is not None:
+        plugin.config["service_target"] = service_target
     received_messages = []
     bus.on("system.mycroft.service.restarted", lambda m: received_messages.append(m))
 
     plugin.handle_mycroft_restart_request(message)
 
-    mock_run.assert_any_call(["launchctl", "stop", "com.ovos.service"], check=True, capture_output=True, text=True)
-    mock_run.assert_any_call(["launchctl", "start", "com.ovos.service"], check=True, capture_output=True, text=True)
+    mock_run.assert_called_once_with(
+        ["/bin/launchctl", "kickstart", "-k", expected],
+        check=True,
+        close_fds=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
     assert len(received_messages) == 1